@@ -7,22 +7,152 @@ Soyutlama (Abstraction) prensibi kullanılarak tasarlanmıştır.
 Yazar: [Elif Nur Demirezen]
 """
 
+import os
+import re
+import asyncio
 import json
-import ollama
-import locale
-from typing import Dict, Any, Optional
+import hashlib
+import logging
+import time
+import orjson
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
 
-# --- LOCALE AYARLARI ---
-# Hedef: Tarih ve gün isimlerinin Türkçe (yerel formatta) alınmasını garanti altına almak.
-try:
-    locale.setlocale(locale.LC_TIME, "tr_TR.UTF-8")  # Linux/MacOS ortamları için
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_TIME, "Turkish_Turkey.1254")  # Windows ortamları için
-    except locale.Error:
-        pass
+# --- LOGLAMA ---
+# Varsayılan olarak sessizdir (NullHandler); çıktı görmek isteyen uygulama logging.basicConfig ile açar.
+log = logging.getLogger("specter.ai")
+log.addHandler(logging.NullHandler())
+
+# --- TÜRKÇE GÜN İSİMLERİ ---
+# Gün isimleri locale.setlocale yerine sabit tablodan alınır; böylece süreç genelindeki
+# LC_TIME ayarı değiştirilmez ve diğer modüllerin/thread'lerin tarih biçimlendirmesi etkilenmez.
+TR_DAYS = ("Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar")
+
+# --- YANIT ÖNBELLEĞİ AYARLARI ---
+CACHE_FILE = os.path.expanduser("~/.specter_cache.json")  # Yeniden başlatmalar arasında kalıcı önbellek
+CACHE_MAX_ENTRIES = 128
+
+_JSON_DECODER = json.JSONDecoder()
+
+# --- MODEL OTURUM AYARLARI ---
+# Varsayılan model 4-bit nicemlenmiş (Quantized) Llama 3 8B Instruct'tır. Çözümleme (Decode)
+# bellek bant genişliğiyle sınırlı olduğundan, fp16'ya göre ~4 kat küçük ağırlıklar token
+# hızını orantılı olarak artırır. Bedeli: uzun/nüanslı metinlerde hafif kalite kaybı;
+# daha yüksek kalite için "llama3:8b-instruct-q5_K_M" veya "q8_0" varyantları seçilebilir.
+DEFAULT_MODEL = "llama3:8b-instruct-q4_K_M"
+OLLAMA_OPTIONS = {'num_ctx': 4096}
+KEEP_ALIVE = "24h"  # Model (ve KV önek önbelleği) istekler arasında bellekte kalır
+
+# --- BACKEND SEÇİMİ ---
+# SPECTER_AI_BACKEND: "ollama" (varsayılan) veya "llamacpp"
+AI_BACKEND = os.environ.get("SPECTER_AI_BACKEND", "ollama").lower()
+LLAMACPP_URL = os.environ.get("LLAMACPP_URL", "http://localhost:8080")
+
+# --- MAIL ÖN İŞLEME ---
+# Prefill maliyeti prompt uzunluğuyla (en kötü durumda karesel) artar; bu yüzden
+# alıntılanmış eski yazışmalar ve HTML etiketleri atılır, metin üst sınırla kesilir.
+MAX_MAIL_CHARS = 2000
+_QUOTE_HEADER_RE = re.compile(r"^(On .+ wrote:|.+ tarihinde .+ şunu yazdı:)\s*$", re.MULTILINE)
+_QUOTED_LINE_RE = re.compile(r"^>.*\n?", re.MULTILINE)
+_HTML_TAG_RE = re.compile(r"</?[a-zA-Z][a-zA-Z0-9]*(?:\s[^>]*)?/?>")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+_SPACES_RE = re.compile(r"[ \t]{2,}")
+
+def _preprocess_mail(body: str) -> str:
+    """
+    Mail gövdesini modele verilmeden önce sadeleştirir.
+    
+    Alıntı başlığından ("On ... wrote:") sonrasını ve '>' ile başlayan satırları atar,
+    HTML etiketlerini temizler ve sonucu MAX_MAIL_CHARS karakterle sınırlar.
+    """
+    text = body
+    header = _QUOTE_HEADER_RE.search(text)
+    if header:
+        text = text[:header.start()]
+    text = _QUOTED_LINE_RE.sub("", text)
+    text = _HTML_TAG_RE.sub(" ", text)
+    text = _SPACES_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text).strip()
+    if len(text) > MAX_MAIL_CHARS:
+        text = text[:MAX_MAIL_CHARS]
+    if len(text) != len(body):
+        log.debug("ℹ️ Mail ön işlendi: %d -> %d karakter", len(body), len(text))
+    return text
+
+# --- YAPILANDIRILMIŞ ÇIKTI ŞEMALARI (Structured Output) ---
+# Şema modele iletildiğinde çıktı doğrudan geçerli JSON olarak üretilir; ayrıştırma tek adımda yapılır.
+class SummaryReply(BaseModel):
+    """generate_summary_and_reply çıktı şeması."""
+    summary: str
+    draft_reply: str
+    # Modelin atlayabileceği alanlar varsayılan değer alır (örn. tarih içermeyen mail);
+    # sadece yapısal olarak hatalı çıktılar reddedilir.
+    detected_date: Optional[str] = None
+    meeting_title: str = "Toplantı"
+
+class CommandAction(BaseModel):
+    """decide_action çıktı şeması."""
+    target_name: Optional[str] = None
+    draft_text: str
+    extracted_date: Optional[str] = None
+    meeting_title: str = "Toplantı"
+
+_SUMMARY_SCHEMA = SummaryReply.model_json_schema()
+_ACTION_SCHEMA = CommandAction.model_json_schema()
+
+# --- PROMPT ŞABLONLARI ---
+# Sabit kısımlar modül yüklenirken bir kez oluşturulur; çağrı başına sadece değişken alanlar doldurulur.
+# System Prompt Engineering: Modelin rolü ve kısıtlamaları sabittir ve mesajın başında yer alır.
+# Böylece sunucu (Ollama/llama.cpp), değişmeyen önek (Prefix) için KV önbelleğini istekler arasında yeniden kullanır.
+_SUMMARY_SYSTEM_MSG = {'role': 'system', 'content': """
+Sen profesyonel bir kurumsal iletişim asistanısın.
+Kullanıcı mesajında referans zaman bilgileri ve analiz edilecek mail yer alır.
+GÖREVLER:
+1. DİL: Gelen mail Türkçe ise TÜRKÇE, İngilizce ise İNGİLİZCE cevap yaz.
+2. TARİH TESPİTİ: Zaman ifadelerini ISO formatına (YYYY-MM-DDTHH:MM:SS) çevir.
+SADECE JSON FORMATINDA CEVAP VER:
+{
+    "summary": "Mailin tek cümlelik özeti",
+    "draft_reply": "Cevap metni...",
+    "detected_date": "YYYY-MM-DDTHH:MM:SS" (Tarih yoksa null),
+    "meeting_title": "Toplantı: [Konu/Kişi]"
+}
+"""}
+_ACTION_SYSTEM_MSG = {'role': 'system', 'content': """
+Sen üst düzey bir yönetici asistanısın.
+Kullanıcı mesajında referans zaman bilgileri ve kullanıcı emri yer alır.
+
+GÖREVLERİN:
+1. target_name: Kişi ismini bul.
+2. draft_text: Mail taslağını yaz.
+3. extracted_date: Kullanıcı "yarın", "haftaya", "salı günü" gibi bir zaman belirttiyse, 
+   bunu MUTLAKA referans zamana bakarak "YYYY-MM-DDTHH:MM:SS" formatına çevir.
+   Eğer tarih yoksa null ver.
+   
+DİKKAT: "draft_text" içinde tarih geçiyorsa, "extracted_date" asla null olamaz!
+
+SADECE JSON FORMATINDA CEVAP VER:
+{
+    "target_name": "İsim",
+    "draft_text": "Mail metni...",
+    "extracted_date": "2026-01-05T09:00:00", 
+    "meeting_title": "Toplantı: [İsim]"
+}
+"""}
+# Context Injection: Değişken kısım (zaman + içerik) sadece kullanıcı mesajında yer alır
+_SUMMARY_TMPL = "{time_context}\nANALİZ EDİLECEK MAIL:\n{email}"
+_ACTION_TMPL = '{time_context}\nKULLANICI EMRİ: "{query}"'
+_TIME_CONTEXT_TMPL = """
+        REFERANS ZAMAN BİLGİLERİ (Buna Kesinlikle Uy):
+        - BUGÜNÜN TARİHİ: {today} ({today_day})
+        - ŞU ANKİ SAAT: {clock}
+        - YARININ TARİHİ: {tomorrow} ({tomorrow_day})
+        - HAFTAYA BUGÜN: {next_week}
+        - BULUNDUĞUMUZ YIL: {year}
+        """
     
 class BaseAIEngine(ABC):
     """
@@ -35,15 +165,35 @@ class BaseAIEngine(ABC):
     Amaç: İleride Ollama yerine OpenAI, Claude veya başka bir model entegre 
     edilmek istendiğinde, ana kod yapısını değiştirmeden sadece bu sınıfı 
     implemente eden yeni bir sınıf yazılmasını sağlamak.
+    
+    Ortak altyapı (prompt'lar, yanıt önbelleği, JSON ayrıştırma) bu sınıftadır.
+    Aynı görev + aynı içerik için model tekrar çalıştırılmaz: yanıtlar saatlik
+    zaman dilimine (Time Bucket) bağlı bir LRU önbellekte tutulur.
     """
+    _tc_cache: Optional[Tuple[int, str]] = None  # (dakika, zaman bağlamı metni)
     
+    def __init__(self, model_name: str = DEFAULT_MODEL, strict_json: bool = False,
+                 cache_path: Optional[str] = CACHE_FILE):
+        self.model_name = model_name
+        # strict_json: Özet/taslak üretiminde şema tabanlı kısıtlı çözümlemeyi (Grammar) açar.
+        # Kapalıyken çıktı _clean_and_parse_json ile ayrıştırılır ve token üretimi hızlanır.
+        # decide_action şemaya kritik biçimde bağlı olduğundan her zaman kısıtlı çalışır.
+        self.strict_json = strict_json
+        
+        self._cache_path = cache_path
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._load_cache()
+
     @abstractmethod
-    def generate_summary_and_reply(self, email_content: str) -> Dict[str, str]:
+    async def generate_summary_and_reply(self, email_content: str,
+                                         on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
         """
         Gelen e-posta içeriğini analiz eder, özet çıkarır ve taslak cevap hazırlar.
         
         Args:
             email_content (str): Analiz edilecek ham e-posta metni.
+            on_chunk (Callable, optional): Verilirse model çıktısı akış (Streaming) olarak
+                üretilir ve her yeni metin parçası bu fonksiyona iletilir.
             
         Returns:
             Dict[str, str]: Özet, taslak cevap ve tespit edilen tarih bilgilerini içeren sözlük.
@@ -51,7 +201,7 @@ class BaseAIEngine(ABC):
         pass
 
     @abstractmethod
-    def decide_action(self, user_query: str) -> Dict[str, Any]:
+    async def decide_action(self, user_query: str) -> Dict[str, Any]:
         """
         Kullanıcının doğal dildeki komutunu yapılandırılmış bir aksiyona dönüştürür.
         
@@ -63,6 +213,85 @@ class BaseAIEngine(ABC):
         """
         pass
 
+    def warm_up(self) -> None:
+        """
+        Modeli ilk gerçek istekten önce belleğe yükler (Cold Start maliyetini gizler).
+        Bloklayıcıdır; arka plan thread'inde çağrılmalıdır. Varsayılan olarak işlem yapmaz.
+        """
+        pass
+
+    async def generate_summary_and_reply_batch(self, emails: List[str]) -> List[Dict[str, str]]:
+        """
+        Birden fazla e-postayı tek seferde analiz eder (Toplu İşlem / Batching).
+        
+        İstekler asyncio.gather ile eşzamanlı gönderilir; sıcak (yüklü) model tüm mailler
+        için yeniden kullanılır. Sunucu tarafında paralellik OLLAMA_NUM_PARALLEL ile belirlenir.
+        
+        Args:
+            emails (List[str]): Analiz edilecek ham e-posta metinleri.
+            
+        Returns:
+            List[Dict[str, str]]: Girdi sırasıyla eşleşen analiz sonuçları.
+        """
+        return list(await asyncio.gather(*(self.generate_summary_and_reply(e) for e in emails)))
+
+    # --- YANIT ÖNBELLEĞİ (LRU Cache) ---
+
+    def _cache_key(self, task: str, payload: str) -> str:
+        """
+        Önbellek anahtarı: (görev, model, saatlik dilim, normalize edilmiş içerik).
+        Saatlik dilim, prompt'a gömülen zaman bağlamının eskimesini sınırlar.
+        """
+        bucket = datetime.now().strftime('%Y-%m-%d-%H')
+        normalized = " ".join(payload.split())
+        return hashlib.sha1(f"{task}|{self.model_name}|{bucket}|{normalized}".encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key: str, result: Dict[str, Any]) -> None:
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def _load_cache(self) -> None:
+        """Diskteki önbelleği yükler; dosya yoksa veya bozuksa boş önbellekle devam eder."""
+        if not self._cache_path or not os.path.exists(self._cache_path):
+            return
+        try:
+            with open(self._cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            for key, result in list(data.items())[-CACHE_MAX_ENTRIES:]:
+                if isinstance(result, dict):
+                    self._cache[key] = result
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def save_cache(self) -> None:
+        """Önbelleği diske yazar (Uygulama kapanışında çağrılır)."""
+        if not self._cache_path:
+            return
+        try:
+            with open(self._cache_path, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, ensure_ascii=False)
+        except OSError:
+            pass
+
+    def _summary_messages(self, email_content: str) -> List[Dict[str, str]]:
+        """Mail analizi için mesaj listesi: sabit sistem mesajı + değişken kullanıcı mesajı."""
+        email = _preprocess_mail(email_content)
+        user_msg = _SUMMARY_TMPL.format_map({'time_context': self._get_time_context(), 'email': email})
+        return [_SUMMARY_SYSTEM_MSG, {'role': 'user', 'content': user_msg}]
+
+    def _action_messages(self, user_query: str) -> List[Dict[str, str]]:
+        """Komut yorumlama için mesaj listesi: sabit sistem mesajı + değişken kullanıcı mesajı."""
+        user_msg = _ACTION_TMPL.format_map({'time_context': self._get_time_context(), 'query': user_query})
+        return [_ACTION_SYSTEM_MSG, {'role': 'user', 'content': user_msg}]
+
     def _get_time_context(self) -> str:
         """
         LLM (Large Language Model) için zamansal bağlam (Temporal Context) oluşturur.
@@ -70,28 +299,55 @@ class BaseAIEngine(ABC):
         LLM'ler "şimdi" kavramına sahip değildir. Bu metod, modele referans alabileceği
         statik bir zaman penceresi sunar.
         
+        Metin sadece dakika değiştiğinde değişir; bu yüzden aynı dakika içinde
+        önbellekten döner ve üretilen prompt'lar byte düzeyinde aynı kalır.
+        
         Returns:
             str: Sistem saatine göre hesaplanmış, prompt içine gömülecek zaman metni.
         """
+        minute = int(time.time()) // 60
+        if self._tc_cache and self._tc_cache[0] == minute:
+            return self._tc_cache[1]
+
         now = datetime.now()
         tomorrow = now + timedelta(days=1)
         next_week = now + timedelta(days=7)
-        
-        return f"""
-        REFERANS ZAMAN BİLGİLERİ (Buna Kesinlikle Uy):
-        - BUGÜNÜN TARİHİ: {now.strftime('%Y-%m-%d')} ({now.strftime('%A')})
-        - ŞU ANKİ SAAT: {now.strftime('%H:%M')}
-        - YARININ TARİHİ: {tomorrow.strftime('%Y-%m-%d')} ({tomorrow.strftime('%A')})
-        - HAFTAYA BUGÜN: {next_week.strftime('%Y-%m-%d')}
-        - BULUNDUĞUMUZ YIL: {now.year}
+        text = _TIME_CONTEXT_TMPL.format_map({
+            'today': now.strftime('%Y-%m-%d'), 'today_day': TR_DAYS[now.weekday()],
+            'clock': now.strftime('%H:%M'),
+            'tomorrow': tomorrow.strftime('%Y-%m-%d'), 'tomorrow_day': TR_DAYS[tomorrow.weekday()],
+            'next_week': next_week.strftime('%Y-%m-%d'), 'year': now.year,
+        })
+        self._tc_cache = (minute, text)
+        return text
+
+    def _parse_structured(self, text: str, schema: Type[BaseModel]) -> Optional[Dict]:
+        """
+        Şemaya uygun LLM çıktısını tek adımda doğrular ve sözlüğe çevirir (Hızlı Yol).
+        Çıktı doğrudan ayrıştırılamazsa (örn. Markdown bloğu) JSON nesnesi _clean_and_parse_json
+        ile çıkarılır ve yine şemaya göre doğrulanır. Şemaya uymayan çıktı (liste, eksik alan)
+        None döner; böylece önbelleğe sadece doğrulanmış sözlükler yazılır.
         """
+        try:
+            return schema.model_validate_json(text).model_dump()
+        except ValidationError:
+            obj = self._clean_and_parse_json(text)
+        if obj is None:
+            return None
+        try:
+            return schema.model_validate(obj).model_dump()
+        except ValidationError as e:
+            log.warning("❌ Şema Doğrulama Hatası: %s", e)
+            return None
 
     def _clean_and_parse_json(self, text: str) -> Optional[Dict]:
         """
         LLM çıktısını temizler ve güvenli bir şekilde JSON formatına ayrıştırır.
         
-        Model bazen çıktıyı Markdown blokları (```json ... ```) içine hapseder.
-        Bu metod, ham string verisini temizleyip Python Dictionary nesnesine çevirir.
+        Model bazen çıktıyı Markdown blokları (```json ... ```) içine hapseder veya
+        JSON'un önüne/arkasına düz metin ekler. Hızlı yol orjson ile doğrudan ayrıştırır;
+        başarısız olursa ilk '{' karakterinden itibaren ilk tam JSON nesnesi okunur
+        (raw_decode), böylece ara kopyalar (split) oluşturulmaz ve sondaki fazlalık yok sayılır.
         
         Args:
             text (str): LLM'den dönen ham yanıt.
@@ -100,17 +356,17 @@ class BaseAIEngine(ABC):
             Optional[Dict]: Başarılı ise sözlük, hata durumunda None.
         """
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            start = text.find("{")
+            if start < 0:
+                log.warning("❌ JSON Parse Hatası: Yanıtta JSON nesnesi bulunamadı")
+                return None
             try:
-                # Markdown formatındaki kod bloklarını temizle
-                if "```json" in text:
-                    text = text.split("```json")[1].split("```")[0]
-                elif "```" in text:
-                    text = text.split("```")[1].split("```")[0]
-                return json.loads(text.strip())
-            except Exception as e:
-                print(f"❌ JSON Parse Hatası: {e}")
+                result, _ = _JSON_DECODER.raw_decode(text, start)
+                return result
+            except json.JSONDecodeError as e:
+                log.warning("❌ JSON Parse Hatası: %s", e)
                 return None
 
 class OllamaClient(BaseAIEngine):
@@ -119,69 +375,159 @@ class OllamaClient(BaseAIEngine):
     
     BaseAIEngine arayüzünü uygulayan somut sınıftır (Concrete Class).
     Yerel makinede çalışan (Local Host) Ollama modelleri ile iletişim kurar.
+    İstekler AsyncClient üzerinden yapılır; böylece model beklenirken event loop
+    serbest kalır ve MCP çağrıları ile paralel yürütülebilir.
     """
-    def __init__(self, model_name: str = "llama3"):
-        self.model_name = model_name
+    def __init__(self, model_name: str = DEFAULT_MODEL, strict_json: bool = False,
+                 cache_path: Optional[str] = CACHE_FILE):
+        super().__init__(model_name, strict_json, cache_path)
+        import ollama  # Ertelenmiş import: modül yüklemesi ucuz kalır, maliyet ilk istemcide ödenir
+        self._client = ollama.AsyncClient()
 
-    def generate_summary_and_reply(self, email_content: str) -> Dict[str, str]:
-        # Context Injection: Modelin zaman algısını oluştur
-        time_context = self._get_time_context()
-        
-        # System Prompt Engineering: Modelin rolünü ve kısıtlamalarını belirle
-        prompt = f"""
-        Sen profesyonel bir kurumsal iletişim asistanısın.
-        {time_context}
-        ANALİZ EDİLECEK MAIL:
-        {email_content}
-        GÖREVLER:
-        1. DİL: Gelen mail Türkçe ise TÜRKÇE, İngilizce ise İNGİLİZCE cevap yaz.
-        2. TARİH TESPİTİ: Zaman ifadelerini ISO formatına (YYYY-MM-DDTHH:MM:SS) çevir.
-        SADECE JSON FORMATINDA CEVAP VER:
-        {{
-            "summary": "Mailin tek cümlelik özeti",
-            "draft_reply": "Cevap metni...",
-            "detected_date": "YYYY-MM-DDTHH:MM:SS" (Tarih yoksa null),
-            "meeting_title": "Toplantı: [Konu/Kişi]"
-        }}
-        """
+    def warm_up(self) -> None:
+        # Boş prompt ile generate, modeli VRAM'e yükler ama token üretmez
+        import ollama
         try:
-            response = ollama.chat(model=self.model_name, messages=[{'role': 'user', 'content': prompt}], format='json')
-            result = self._clean_and_parse_json(response['message']['content'])
-            if result: return result
+            ollama.generate(model=self.model_name, prompt="", keep_alive=KEEP_ALIVE)
+        except Exception as e:
+            log.warning("⚠️ Model ısıtma başarısız: %s", e)
+
+    async def generate_summary_and_reply(self, email_content: str,
+                                         on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+        cache_key = self._cache_key("summary", email_content)
+        cached = self._cache_get(cache_key)
+        if cached: return cached
+
+        messages = self._summary_messages(email_content)
+        extra = {'format': _SUMMARY_SCHEMA} if self.strict_json else {}
+        try:
+            if on_chunk:
+                # Akış modu: parçalar geldikçe arayüze iletilir, JSON akış bitince ayrıştırılır
+                content = ""
+                stream = await self._client.chat(model=self.model_name, messages=messages, stream=True,
+                                                 options=OLLAMA_OPTIONS, keep_alive=KEEP_ALIVE, **extra)
+                async for part in stream:
+                    delta = part['message']['content']
+                    if delta:
+                        content += delta
+                        on_chunk(delta)
+            else:
+                response = await self._client.chat(model=self.model_name, messages=messages,
+                                                   options=OLLAMA_OPTIONS, keep_alive=KEEP_ALIVE, **extra)
+                content = response['message']['content']
+            result = self._parse_structured(content, SummaryReply)
+            if result:
+                self._cache_put(cache_key, result)
+                return result
             raise ValueError("Boş Yanıt")
         except Exception as e:
             return {"summary": "Hata", "draft_reply": f"Hata: {e}", "detected_date": None, "meeting_title": "Hata"}
 
-    def decide_action(self, user_query: str) -> Dict[str, Any]:
-        time_context = self._get_time_context()
-        # DEĞİŞİKLİK BURADA BAŞLIYOR
-        prompt = f"""
-        Sen üst düzey bir yönetici asistanısın.
-        {time_context}
-        KULLANICI EMRİ: "{user_query}"
-        
-        GÖREVLERİN:
-        1. target_name: Kişi ismini bul.
-        2. draft_text: Mail taslağını yaz.
-        3. extracted_date: Kullanıcı "yarın", "haftaya", "salı günü" gibi bir zaman belirttiyse, 
-           bunu MUTLAKA yukarıdaki referans zamana bakarak "YYYY-MM-DDTHH:MM:SS" formatına çevir.
-           Eğer tarih yoksa null ver.
-           
-        DİKKAT: "draft_text" içinde tarih geçiyorsa, "extracted_date" asla null olamaz!
-        
-        SADECE JSON FORMATINDA CEVAP VER:
-        {{
-            "target_name": "İsim",
-            "draft_text": "Mail metni...",
-            "extracted_date": "2026-01-05T09:00:00", 
-            "meeting_title": "Toplantı: [İsim]"
-        }}
-        """
+    async def decide_action(self, user_query: str) -> Dict[str, Any]:
+        cache_key = self._cache_key("action", user_query)
+        cached = self._cache_get(cache_key)
+        if cached: return cached
+
+        messages = self._action_messages(user_query)
+        try:
+            response = await self._client.chat(model=self.model_name, messages=messages, format=_ACTION_SCHEMA,
+                                               options=OLLAMA_OPTIONS, keep_alive=KEEP_ALIVE)
+            result = self._parse_structured(response['message']['content'], CommandAction)
+            if not result:
+                return {"target_name": None, "draft_text": "AI yanıtı anlaşılamadı.", "extracted_date": None, "meeting_title": "Hata"}
+            self._cache_put(cache_key, result)
+            return result
+        except Exception as e:
+            return {"target_name": None, "draft_text": "Sistem hatası.", "extracted_date": None, "meeting_title": "Hata"}
+
+class LlamaCppClient(BaseAIEngine):
+    """
+    llama.cpp Sunucu İstemcisi.
+    
+    BaseAIEngine arayüzünü, llama.cpp `llama-server`ın OpenAI uyumlu
+    `/v1/chat/completions` uç noktası üzerinden uygular. Aynı GGUF ağırlıkları için
+    GPU offload, KV önbellek nicemleme (Quantization) ve flash-attention ayarlarına
+    doğrudan erişim sağlar. Önerilen başlatma:
+    
+        llama-server -m llama3-8b-instruct.Q4_K_M.gguf -ngl 999 --flash-attn \\
+                     --cache-type-k q4_0 --cache-type-v q4_0 --parallel 4 --cont-batching --port 8080
+    
+    q4_0 KV önbelleği VRAM kullanımını en aza indirir; uzun bağlamlarda kalite
+    kaybı fark edilirse q8_0 kullanılabilir.
+    
+    Sabit sistem mesajının KV durumu `--slot-save-path` ile diske kaydedilip
+    yeniden başlatmalarda geri yüklenebilir.
+    """
+    def __init__(self, model_name: str = DEFAULT_MODEL, base_url: str = LLAMACPP_URL,
+                 strict_json: bool = False, cache_path: Optional[str] = CACHE_FILE):
+        super().__init__(model_name, strict_json, cache_path)
+        import httpx  # Ertelenmiş import: sadece llama.cpp backend seçildiğinde yüklenir
+        self._http = httpx.AsyncClient(base_url=base_url, timeout=None)
+
+    async def _complete(self, messages: List[Dict[str, str]], schema: Optional[Dict[str, Any]],
+                        on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Sohbet tamamlama isteği gönderir; on_chunk verilirse SSE akışını okur."""
+        body = {"model": self.model_name, "messages": messages, "cache_prompt": True}
+        if schema:
+            body["response_format"] = {"type": "json_object", "schema": schema}
+        if not on_chunk:
+            response = await self._http.post("/v1/chat/completions", json=body)
+            response.raise_for_status()
+            return response.json()["choices"][0]["message"]["content"]
+
+        body["stream"] = True
+        content = ""
+        async with self._http.stream("POST", "/v1/chat/completions", json=body) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "): continue
+                data = line[6:]
+                if data == "[DONE]": break
+                delta = orjson.loads(data)["choices"][0]["delta"].get("content")
+                if delta:
+                    content += delta
+                    on_chunk(delta)
+        return content
+
+    async def generate_summary_and_reply(self, email_content: str,
+                                         on_chunk: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+        cache_key = self._cache_key("summary", email_content)
+        cached = self._cache_get(cache_key)
+        if cached: return cached
+
         try:
-            response = ollama.chat(model=self.model_name, messages=[{'role': 'user', 'content': prompt}], format='json')
-            result = self._clean_and_parse_json(response['message']['content'])
+            schema = _SUMMARY_SCHEMA if self.strict_json else None
+            content = await self._complete(self._summary_messages(email_content), schema, on_chunk)
+            result = self._parse_structured(content, SummaryReply)
+            if result:
+                self._cache_put(cache_key, result)
+                return result
+            raise ValueError("Boş Yanıt")
+        except Exception as e:
+            return {"summary": "Hata", "draft_reply": f"Hata: {e}", "detected_date": None, "meeting_title": "Hata"}
+
+    async def decide_action(self, user_query: str) -> Dict[str, Any]:
+        cache_key = self._cache_key("action", user_query)
+        cached = self._cache_get(cache_key)
+        if cached: return cached
+
+        try:
+            content = await self._complete(self._action_messages(user_query), _ACTION_SCHEMA)
+            result = self._parse_structured(content, CommandAction)
             if not result:
                 return {"target_name": None, "draft_text": "AI yanıtı anlaşılamadı.", "extracted_date": None, "meeting_title": "Hata"}
+            self._cache_put(cache_key, result)
             return result
         except Exception as e:
-            return {"target_name": None, "draft_text": "Sistem hatası.", "extracted_date": None, "meeting_title": "Hata"}
\ No newline at end of file
+            return {"target_name": None, "draft_text": "Sistem hatası.", "extracted_date": None, "meeting_title": "Hata"}
+
+def create_engine(**kwargs) -> BaseAIEngine:
+    """
+    Factory: SPECTER_AI_BACKEND ortam değişkenine göre uygun AI istemcisini oluşturur.
+    
+    Returns:
+        BaseAIEngine: "llamacpp" için LlamaCppClient, aksi halde OllamaClient.
+    """
+    if AI_BACKEND == "llamacpp":
+        return LlamaCppClient(**kwargs)
+    return OllamaClient(**kwargs)
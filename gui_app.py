@@ -5,21 +5,32 @@ Kullanıcı Arayüzü (Frontend) modülü.
 PyQt5 kütüphanesi kullanılarak geliştirilmiştir.
 
 Mimari Özellikler:
-- Multithreading (QThread ile Asenkron İşlemler)
+- Multithreading (QThreadPool üzerinde QRunnable görevleri ile Asenkron İşlemler)
 - IPC (Inter-Process Communication) ile Backend (Server) Haberleşmesi
+- Kalıcı MCP Oturumu (Sunucu uygulama ömrü boyunca bir kez başlatılır)
 
 Yazar: [Elif Nur Demirezen]
 """
+import os
 import sys
 import asyncio
-import re
+import concurrent.futures
+import threading
+from typing import Optional
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QTextEdit, QLabel, 
                              QMessageBox, QFrame, QLineEdit)
-from PyQt5.QtCore import QThread, pyqtSignal
-from ai_engine import OllamaClient
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QTextCursor
+from ai_engine import BaseAIEngine, create_engine
+
+# MCP sunucu süreci: yorumlayıcı yolu ve argümanlar modül yüklenirken bir kez çözülür
+SERVER_COMMAND = sys.executable
+SERVER_ARGS = ["server.py"]
+
+SENDER_PREFIX = "SenderEmail:"
+BATCH_SIZE = 5  # "Son N Maili Analiz Et" butonunun işleyeceği mail sayısı
+WORKER_POLL_INTERVAL = 0.5  # Worker'ın sonucu beklerken kapanış durumunu kontrol etme aralığı (saniye)
 
 # --- UI STİL TANIMLAMALARI (CSS) ---
 STYLESHEET = """
@@ -37,84 +48,267 @@ QPushButton#CommandBtn { background-color: #7c4dff; color: white; }
 QTextEdit, QLineEdit { background-color: #2d2d2d; color: #fff; border: 1px solid #444; border-radius: 5px; font-family: 'Consolas'; padding: 5px; }
 """
 
-class Worker(QThread):
+def _guess_target_name(command: str) -> Optional[str]:
     """
-    Arka Plan İşçisi (Worker Thread).
+    Komuttan hedef kişi ismini kaba bir sezgisel ile tahmin eder (Örn: "Elif'e" -> "Elif").
+
+    Türkçede özel isimlere gelen ekler kesme işaretiyle ayrıldığı için önce bu
+    kelimelere, yoksa büyük harfle başlayan ilk kelimeye bakılır.
+    """
+    words = [w.strip(".,!?\"") for w in command.split()]
+    for word in words:
+        if "'" in word or "’" in word:
+            return word.replace("’", "'").split("'")[0] or None
+    return next((w for w in words if w[:1].isupper()), None)
+
+def _extract_sender(raw_mail: str) -> Optional[str]:
+    """
+    get_latest_email çıktısındaki "SenderEmail:" satırından adresi ayıklar.
+    Regex yerine tek bir alt dizi taraması (str.find) kullanılır.
+    """
+    idx = raw_mail.find(SENDER_PREFIX)
+    if idx < 0:
+        return None
+    start = idx + len(SENDER_PREFIX)
+    end = raw_mail.find("\n", start)
+    sender = raw_mail[start:end if end >= 0 else None].strip()
+    return sender if "@" in sender else None
+
+def _is_connection_lost(e: Exception) -> bool:
+    """Hatanın MCP sunucusuyla bağlantının kopmasından kaynaklanıp kaynaklanmadığını belirler."""
+    import anyio
+    from mcp.shared.exceptions import McpError
+    from mcp.types import CONNECTION_CLOSED
+    if isinstance(e, McpError):
+        return e.error.code == CONNECTION_CLOSED
+    return isinstance(e, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream,
+                          ConnectionError))
+
+class MCPService(QObject):
+    """
+    Kalıcı MCP Oturumu (Persistent Session).
+
+    server.py alt sürecini ve ClientSession'ı bir kez başlatır ve açık tutar.
+    Oturum, arka planda sürekli çalışan özel bir asyncio döngüsünde (Event Loop) yaşar;
+    Worker'lar işlerini bu döngüye `submit` ile gönderir. Böylece her tıklamada
+    yorumlayıcı başlatma + MCP el sıkışma (Handshake) maliyeti ödenmez.
+    Sunucu çökerse veya başlatılamazsa bir sonraki iş yeni bir oturum açar.
+    """
+    def __init__(self):
+        super().__init__()
+        self.loop = asyncio.new_event_loop()
+        self.session = None
+        # Oturum durumu sadece döngü thread'inde değiştirilir (_open_session)
+        self._lifetime = None # Oturumu açık tutan görev (Task)
+        self._ready = None # Oturum hazır olduğunda tamamlanır
+        self._stop = None # Kapatma sinyali
+        self._jobs = set() # submit ile gönderilmiş, henüz bitmemiş görevler
+        self.closed = False
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+        self.loop.call_soon_threadsafe(self._open_session) # Sunucu ilk tıklamadan önce hazırlanır
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _open_session(self):
+        """Yeni bir oturum görevi başlatır (döngü thread'inde çağrılır)."""
+        self._ready = self.loop.create_future()
+        self._stop = asyncio.Event()
+        self._lifetime = self.loop.create_task(self._serve(self._ready, self._stop))
+
+    async def _serve(self, ready: asyncio.Future, stop: asyncio.Event):
+        """
+        Oturumun yaşam döngüsü.
+        stdio_client/ClientSession bağlamları aynı görev (Task) içinde açılıp kapanmalıdır;
+        bu yüzden oturum, kapatma sinyali gelene kadar bu coroutine içinde tutulur.
+        Başlatma hatası `ready` üzerinden işlere iletilir; görev biter ve sonraki iş yeniden dener.
+        """
+        # Ertelenmiş import: mcp yalnızca oturum açılırken (arka plan thread'inde) yüklenir
+        from mcp import ClientSession, StdioServerParameters
+        from mcp.client.stdio import stdio_client
+        
+        server_params = StdioServerParameters(command=SERVER_COMMAND, args=SERVER_ARGS, env=None)
+        try:
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    ready.set_result(session)
+                    await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            self.session = None
+
+    async def _ensure_session(self):
+        """Açık oturumu döndürür; oturum hiç açılmadıysa veya sona erdiyse yenisini başlatır."""
+        if self._lifetime is None or self._lifetime.done():
+            self._open_session()
+        lifetime, ready = self._lifetime, self._ready
+        # shield: bir işin iptali, diğer işlerin de beklediği ortak Future'ı iptal etmemeli
+        return lifetime, await asyncio.shield(ready)
+
+    async def _close_session(self, lifetime):
+        """Verilen oturumu kapatır ve alt sürecin sonlanmasını bekler."""
+        if self._lifetime is not lifetime:
+            return # Başka bir iş oturumu zaten yeniledi
+        self._stop.set()
+        await asyncio.gather(lifetime, return_exceptions=True)
+
+    def submit(self, coro_factory) -> concurrent.futures.Future:
+        """
+        `coro_factory(session)` coroutine'ini oturum döngüsünde çalıştırır ve Future döndürür.
+        Bağlantı koptuysa (sunucu sonlandı) oturum yeniden açılır ve iş bir kez tekrarlanır.
+        """
+        async def _run():
+            task = asyncio.current_task()
+            self._jobs.add(task)
+            try:
+                for attempt in range(2):
+                    lifetime, session = await self._ensure_session()
+                    try:
+                        return await coro_factory(session)
+                    except Exception as e:
+                        if attempt or not _is_connection_lost(e):
+                            raise
+                        await self._close_session(lifetime)
+            finally:
+                self._jobs.discard(task)
+        return asyncio.run_coroutine_threadsafe(_run(), self.loop)
+
+    async def _cancel_jobs(self):
+        """Bekleyen işleri iptal eder; böylece Worker'ların beklediği Future'lar sonuçlanır."""
+        jobs = list(self._jobs)
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+
+    async def _close(self):
+        """Kapanış: önce bekleyen işler iptal edilir, ardından oturum kapatılır."""
+        await self._cancel_jobs()
+        if self._lifetime is not None:
+            await self._close_session(self._lifetime)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Bekleyen işleri iptal eder, oturumu kapatır, alt süreci sonlandırır ve döngüyü durdurur."""
+        self.closed = True
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), self.loop).result(timeout=timeout)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=timeout)
+
+class WorkerSignals(QObject):
+    """QRunnable bir QObject olmadığından, Worker sinyalleri bu yardımcı nesnede taşınır."""
+    finished = pyqtSignal(dict) # İşlem tamamlandığında GUI'ye veri taşıyan sinyal
+    chunk = pyqtSignal(str)     # AI çıktısı akarken gelen her metin parçası
+
+class Worker(QRunnable):
+    """
+    Arka Plan İşçisi (Worker Task).
     
     GUI'nin donmasını (Freezing) engellemek için, ağ istekleri ve AI işlemleri
     bu sınıf içinde, ana akıştan (Main Thread) bağımsız bir iş parçacığında çalıştırılır.
+    Her işlem için yeni bir thread açılmaz; görevler ortak QThreadPool üzerinde koşar.
+    İşin kendisi MCPService döngüsünde yürütülür; Worker yalnızca sonucu bekler.
     """
-    finished = pyqtSignal(dict) # İşlem tamamlandığında GUI'ye veri taşıyan sinyal
-    
-    def __init__(self, task: str, payload: dict = None):
+    def __init__(self, mcp_service: MCPService, ai: BaseAIEngine, task: str, payload: dict = None):
         super().__init__()
+        self.signals = WorkerSignals()
+        self.mcp_service = mcp_service
+        self.ai = ai
         self.task = task
         self.payload = payload or {}
-        self.ai = OllamaClient()
 
-    async def _run_async(self):
+    async def _run_async(self, session):
         """
         MCP İstemci Protokolü.
-        server.py dosyasını bir alt süreç (Subprocess) olarak başlatır ve 
-        Stdio (Standart Giriş/Çıkış) üzerinden haberleşir.
+        Kalıcı oturum (session) üzerinden server.py araçlarını çağırır.
         """
-        server_params = StdioServerParameters(command=sys.executable, args=["server.py"], env=None)
-        
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                
-                # Görev Yönlendiricisi (Task Router)
-                if self.task == "analyze_last_mail":
-                    res = await session.call_tool("get_latest_email", arguments={})
-                    raw_mail = res.content[0].text
-                    
-                    # Regex ile gönderen mailini ayıkla
-                    sender_match = re.search(r"SenderEmail: ([\w\.-]+@[\w\.-]+)", raw_mail)
-                    sender_email = sender_match.group(1) if sender_match else None
-                    
-                    # AI Motorunu tetikle
-                    ai_res = self.ai.generate_summary_and_reply(raw_mail)
-                    return {"status": "success", "raw_mail": raw_mail, "sender": sender_email, **ai_res}
-
-                elif self.task == "process_command":
-                    cmd = self.payload.get("command")
-                    ai_res = self.ai.decide_action(cmd)
-                    found_email = None
-                    
-                    # İsim tespit edildiyse sunucudan mail adresini iste
-                    if ai_res.get("target_name"):
-                        email_res = await session.call_tool("find_email_by_name", arguments={"name": ai_res.get("target_name")})
-                        if "@" in email_res.content[0].text:
-                            found_email = email_res.content[0].text
-                    return {"status": "command_processed", "found_email": found_email, **ai_res}
-
-                elif self.task == "send_reply":
-                    await session.call_tool("send_email_action", arguments=self.payload)
-                    return {"status": "sent"}
-
-                elif self.task == "add_calendar":
-                    res = await session.call_tool("schedule_meeting", arguments=self.payload)
-                    return {"status": "calendar_added", "msg": res.content[0].text}
+        # Görev Yönlendiricisi (Task Router)
+        if self.task == "analyze_last_mail":
+            res = await session.call_tool("get_latest_email", arguments={})
+            raw_mail = res.content[0].text
+
+            # Gönderen mailini ayıkla
+            sender_email = _extract_sender(raw_mail)
+
+            # AI Motorunu tetikle
+            ai_res = await self.ai.generate_summary_and_reply(raw_mail, on_chunk=self.signals.chunk.emit)
+            return {"status": "success", "raw_mail": raw_mail, "sender": sender_email, **ai_res}
+
+        elif self.task == "analyze_batch":
+            res = await session.call_tool("get_latest_emails", arguments={"count": self.payload.get("count", BATCH_SIZE)})
+            raw_mails = [c.text for c in res.content]
+            
+            # Tüm mailler tek turda, eşzamanlı olarak AI Motoruna gönderilir
+            ai_results = await self.ai.generate_summary_and_reply_batch(raw_mails)
+            items = [{"raw_mail": m, "sender": _extract_sender(m), **r} for m, r in zip(raw_mails, ai_results)]
+            return {"status": "batch_done", "items": items}
+
+        elif self.task == "process_command":
+            cmd = self.payload.get("command")
+            guess = _guess_target_name(cmd)
+            found_email = None
+
+            # Spekülatif arama: AI düşünürken tahmini isim için rehber sorgusu paralel yürütülür
+            if guess:
+                ai_res, guess_res = await asyncio.gather(
+                    self.ai.decide_action(cmd),
+                    session.call_tool("find_email_by_name", arguments={"name": guess}))
+            else:
+                ai_res, guess_res = await self.ai.decide_action(cmd), None
+
+            # İsim tespit edildiyse sunucudan mail adresini iste (tahmin tuttuysa tekrar sorma)
+            target = ai_res.get("target_name")
+            if target:
+                if guess_res is not None and target.strip().lower() == guess.lower():
+                    email_res = guess_res
+                else:
+                    email_res = await session.call_tool("find_email_by_name", arguments={"name": target})
+                if "@" in email_res.content[0].text:
+                    found_email = email_res.content[0].text
+            return {"status": "command_processed", "found_email": found_email, **ai_res}
+
+        elif self.task == "send_reply":
+            await session.call_tool("send_email_action", arguments=self.payload)
+            return {"status": "sent"}
+
+        elif self.task == "add_calendar":
+            res = await session.call_tool("schedule_meeting", arguments=self.payload)
+            return {"status": "calendar_added", "msg": res.content[0].text}
 
     def run(self):
-        """Thread başladığında (start) devreye giren giriş noktası."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        """Görev havuzda çalışmaya başladığında devreye giren giriş noktası."""
+        future = self.mcp_service.submit(self._run_async)
         try:
-            res = loop.run_until_complete(self._run_async())
-            self.finished.emit(res)
+            # Uygulama kapanırken sonsuza kadar beklememek için sonuç aralıklarla kontrol edilir
+            while True:
+                try:
+                    res = future.result(timeout=WORKER_POLL_INTERVAL)
+                    break
+                except concurrent.futures.TimeoutError:
+                    if self.mcp_service.closed:
+                        future.cancel()
+                        return
+            self.signals.finished.emit(res)
+        except concurrent.futures.CancelledError:
+            return # Kapanış sırasında iptal edildi; sonucu bekleyen bir arayüz kalmadı
         except Exception as e:
-            self.finished.emit({"status": "error", "msg": str(e)})
-        finally:
-            loop.close()
+            # Bazı istisnalar (örn. ClosedResourceError) boş mesaj taşır; tür adı gösterilir
+            self.signals.finished.emit({"status": "error", "msg": str(e) or repr(e)})
 
 class AI_Mail_Assistant(QMainWindow):
     """
     Ana Pencere Sınıfı.
     
     Kullanıcı arayüzünü oluşturur, düzenler ve kullanıcı etkileşimlerini (Events)
-    ilgili Worker thread'lerine yönlendirir.
+    ortak QThreadPool'a gönderilen Worker görevlerine (QRunnable) yönlendirir.
+    İşlerin kendisi MCPService'in asyncio döngüsünde yürütülür.
     """
     def __init__(self):
         super().__init__()
@@ -127,7 +321,26 @@ class AI_Mail_Assistant(QMainWindow):
         self.detected_date = None
         self.meeting_title = "Toplantı"
         
+        # MCP sunucusu bir kez başlatılır ve tüm işlemler boyunca yeniden kullanılır
+        self.mcp_service = MCPService()
+        # AI istemcisi paylaşılır; böylece yanıt önbelleği tüm işlemler arasında ortaktır
+        self.ai = create_engine()
+        
+        # Görevler, her seferinde yeni thread açmak yerine ortak bir havuzda çalıştırılır
+        self.pool = QThreadPool.globalInstance()
+        self.pool.setMaxThreadCount(4)
+        self._active_workers = set() # Havuzdaki görevlerin sinyal nesnelerini canlı tutar
+        
         self.init_ui()
+        
+        # Model yüklemesi, kullanıcı arayüzü incelerken arka planda tamamlanır
+        threading.Thread(target=self.ai.warm_up, daemon=True).start()
+
+    def closeEvent(self, event):
+        """Pencere kapanırken kalıcı MCP oturumunu sonlandırır ve AI önbelleğini diske yazar."""
+        self.mcp_service.shutdown()
+        self.ai.save_cache()
+        super().closeEvent(event)
 
     def init_ui(self):
         """Arayüz bileşenlerini (Widgets) ve yerleşimi (Layout) başlatır."""
@@ -160,6 +373,17 @@ class AI_Mail_Assistant(QMainWindow):
         self.btn_analyze.clicked.connect(self.start_analysis)
         lay_act.addWidget(self.btn_analyze)
         
+        self.btn_analyze_batch = QPushButton(f"📚 Son {BATCH_SIZE} Maili Analiz Et")
+        self.btn_analyze_batch.clicked.connect(self.start_batch_analysis)
+        lay_act.addWidget(self.btn_analyze_batch)
+        
+        h_model = QHBoxLayout()
+        h_model.addWidget(QLabel("Model:", objectName="Info"))
+        self.input_model = QLineEdit(self.ai.model_name)
+        self.input_model.editingFinished.connect(self.change_model)
+        h_model.addWidget(self.input_model)
+        lay_act.addLayout(h_model)
+        
         self.status_lbl = QLabel("Sistem hazır.", objectName="Info")
         lay_act.addWidget(self.status_lbl)
         layout.addWidget(card_action)
@@ -230,12 +454,33 @@ class AI_Mail_Assistant(QMainWindow):
 
     # --- İŞ MANTIĞI (Business Logic) ---
 
+    def _start_worker(self, task: str, payload: Optional[dict], on_done, on_chunk=None) -> None:
+        """Görevi ortak thread havuzuna gönderir ve tamamlanma/akış sinyallerini bağlar."""
+        worker = Worker(self.mcp_service, self.ai, task, payload)
+        worker.signals.finished.connect(on_done)
+        if on_chunk:
+            worker.signals.chunk.connect(on_chunk)
+        worker.signals.finished.connect(lambda _: self._active_workers.discard(worker))
+        self._active_workers.add(worker)
+        self.pool.start(worker)
+
+    def change_model(self):
+        """Kullanılan modeli değiştirir ve yeni modeli arka planda belleğe yükler."""
+        name = self.input_model.text().strip()
+        if not name or name == self.ai.model_name: return
+        self.ai.model_name = name
+        self.status_lbl.setText(f"ℹ️ Model: {name}")
+        threading.Thread(target=self.ai.warm_up, daemon=True).start()
+
     def start_analysis(self):
         """Mail analiz sürecini başlatır."""
         self._set_processing_state(True, "⏳ Son mail analiz ediliyor...")
-        self.worker = Worker("analyze_last_mail")
-        self.worker.finished.connect(self.on_analysis_done)
-        self.worker.start()
+        self._start_worker("analyze_last_mail", None, self.on_analysis_done, self.on_stream_chunk)
+
+    def start_batch_analysis(self):
+        """Son N mailin toplu analiz sürecini başlatır."""
+        self._set_processing_state(True, f"⏳ Son {BATCH_SIZE} mail analiz ediliyor...")
+        self._start_worker("analyze_batch", {"count": BATCH_SIZE}, self.on_batch_done)
 
     def run_custom_command(self):
         """Doğal dil komutunu işler."""
@@ -244,13 +489,12 @@ class AI_Mail_Assistant(QMainWindow):
         self.status_lbl.setText(f"⚙️ İşleniyor: {cmd}")
         self.input_cmd.clear()
         self.card_calendar.setVisible(False)
-        self.worker = Worker("process_command", {"command": cmd})
-        self.worker.finished.connect(self.on_command_done)
-        self.worker.start()
+        self._start_worker("process_command", {"command": cmd}, self.on_command_done)
 
     def _set_processing_state(self, processing: bool, msg: str):
         """UI durumunu (Meşgul/Hazır) günceller."""
         self.btn_analyze.setEnabled(not processing)
+        self.btn_analyze_batch.setEnabled(not processing)
         self.btn_send.setEnabled(False)
         self.status_lbl.setText(msg)
         if processing:
@@ -258,9 +502,15 @@ class AI_Mail_Assistant(QMainWindow):
             self.txt_draft.clear()
             self.card_calendar.setVisible(False)
 
+    def on_stream_chunk(self, delta: str):
+        """Model çıktısı akarken gelen parçaları taslak alanına ekler (Ön izleme)."""
+        self.txt_draft.moveCursor(QTextCursor.End)
+        self.txt_draft.insertPlainText(delta)
+
     def on_analysis_done(self, res):
         """Analiz tamamlandığında sonuçları UI'ya basar."""
         self.btn_analyze.setEnabled(True)
+        self.btn_analyze_batch.setEnabled(True)
         if res.get("status") == "error":
             QMessageBox.critical(self, "Hata", res.get("msg"))
             self.status_lbl.setText("❌ Hata.")
@@ -270,6 +520,26 @@ class AI_Mail_Assistant(QMainWindow):
         self.txt_summary.setText(res.get("summary"))
         self.update_draft_area(res.get("draft_reply"), res.get("sender"), res.get("detected_date"), res.get("meeting_title"))
 
+    def on_batch_done(self, res):
+        """Toplu analiz tamamlandığında özetleri listeler, en yeni mailin taslağını hazırlar."""
+        self.btn_analyze.setEnabled(True)
+        self.btn_analyze_batch.setEnabled(True)
+        if res.get("status") == "error":
+            QMessageBox.critical(self, "Hata", res.get("msg"))
+            self.status_lbl.setText("❌ Hata.")
+            return
+
+        items = res.get("items", [])
+        if not items:
+            self.status_lbl.setText("ℹ️ Gelen kutusu boş.")
+            return
+
+        self.status_lbl.setText(f"✅ {len(items)} mail analiz edildi.")
+        self.txt_summary.setText("\n\n".join(
+            f"[{i}] {item.get('sender') or '-'}\n{item.get('summary')}" for i, item in enumerate(items, 1)))
+        latest = items[0]
+        self.update_draft_area(latest.get("draft_reply"), latest.get("sender"), latest.get("detected_date"), latest.get("meeting_title"))
+
     def on_command_done(self, res):
         """Komut işleme tamamlandığında sonuçları UI'ya basar."""
         if res.get("status") == "error": return
@@ -293,24 +563,23 @@ class AI_Mail_Assistant(QMainWindow):
 
     def send_mail(self):
         """Mail gönderimini tetikler."""
-        self.worker = Worker("send_reply", {
+        self._start_worker("send_reply", {
             "to_email": self.current_sender,
             "subject": f"Konu: {self.meeting_title}",
             "content": self.txt_draft.toPlainText()
-        })
-        self.worker.finished.connect(lambda: QMessageBox.information(self, "Bilgi", "Mail Gönderildi!"))
-        self.worker.start()
+        }, lambda: QMessageBox.information(self, "Bilgi", "Mail Gönderildi!"))
 
     def add_to_calendar(self):
         """Takvim kaydını tetikler."""
-        self.worker = Worker("add_calendar", {
+        self._start_worker("add_calendar", {
             "summary": self.meeting_title,
             "iso_datetime": self.detected_date
-        })
-        self.worker.finished.connect(lambda x: QMessageBox.information(self, "Takvim", x.get("msg")))
-        self.worker.start()
+        }, lambda x: QMessageBox.information(self, "Takvim", x.get("msg")))
 
 if __name__ == "__main__":
+    # Ollama sunucusu bu ortamdan başlatılırsa modeli bellekte tutar ve paralel isteklere izin verir
+    os.environ.setdefault("OLLAMA_KEEP_ALIVE", "24h")
+    os.environ.setdefault("OLLAMA_NUM_PARALLEL", "2")
     app = QApplication(sys.argv)
     window = AI_Mail_Assistant()
     window.show()
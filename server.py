@@ -13,29 +13,55 @@ Yazar: [Elif Nur Demirezen]
 """
 
 import os.path
+import asyncio
 import base64
-import difflib
+import json
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
-from datetime import datetime, timedelta
-from typing import Optional
-
+from http.client import HTTPException
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import google_auth_httplib2
+import httplib2
+from google.auth.exceptions import GoogleAuthError
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build, Resource
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
 from mcp.server.fastmcp import FastMCP
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError: # rapidfuzz opsiyoneldir; yoksa standart kütüphanedeki difflib kullanılır
+    import difflib
+    process = None
+
 # --- KONFİGÜRASYON ---
 CONTACTS_FILE_NAME = "Specter_Contact_List"
+STATE_FILE = ".specter_server_cache.json"  # Yeniden başlatmalar arasında saklanan sunucu durumu (rehber kimliği)
+TOKEN_REFRESH_LEEWAY = timedelta(seconds=300)  # Süresine bu kadar kalan token yenilenir
+CONTACTS_CACHE_TTL = 60  # Rehber satırlarının bellekte tutulma süresi (saniye)
+FUZZY_SCORE_CUTOFF = 60  # Bulanık eşleşme için minimum benzerlik skoru (0-100)
+GMAIL_USER_ID = 'me'  # Gmail API'de yetkilendirilmiş kullanıcının kendisi
+CALENDAR_ID = 'primary'  # Etkinliklerin ekleneceği takvim
+CALENDAR_BATCH_LIMIT = 50  # Calendar Batch isteği başına en fazla alt istek sayısı
+_TZ = {'timeZone': 'Europe/Istanbul'}  # Takvim etkinliklerinin saat dilimi
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)  # 3.11+ sondaki 'Z' ekini doğrudan çözümler
 # Google API Scopes (Erişim Kapsamları):
 # Uygulamanın kullanıcının hesabında nelere erişebileceğini tanımlar.
-SCOPES = [
+SCOPES = (
     'https://www.googleapis.com/auth/gmail.modify', 
     'https://www.googleapis.com/auth/calendar',
     'https://www.googleapis.com/auth/spreadsheets', 
     'https://www.googleapis.com/auth/drive'         
-]
+)
 
 # --- YARDIMCI FONKSİYONLAR ---
 def log(msg: str) -> None:
@@ -48,6 +74,18 @@ def log(msg: str) -> None:
     sys.stderr.write(f"{msg}\n")
     sys.stderr.flush()
 
+# Beklenen (operasyonel) hatalar: API yanıt hataları ve ağ/yetkilendirme sorunları.
+# Bunların dışındaki istisnalar gerçek hatalardır ve yutulmaz.
+_API_ERRORS = (HttpError, OSError, HTTPException, httplib2.HttpLib2Error, GoogleAuthError)
+
+def _describe_api_error(e: Exception) -> str:
+    """API hatasını kısa bir mesaja dönüştürür; HttpError gövdesi (JSON) biçimlendirilmez."""
+    if isinstance(e, HttpError):
+        # BatchError da bir HttpError'dır ancak yanıt (resp) olmadan fırlatılabilir
+        status = getattr(e.resp, "status", None)
+        return f"API hatası ({status if status is not None else e.reason})"
+    return f"Bağlantı hatası: {e}"
+
 # --- KİMLİK DOĞRULAMA SERVİSİ ---
 class GoogleAuthManager:
     """
@@ -59,29 +97,73 @@ class GoogleAuthManager:
     """
     def __init__(self):
         self.creds = None
+        self._refresh_lock = threading.Lock() # Eşzamanlı yenileme isteklerini tekilleştirir
         self._authenticate()
+        # Servisler (Drive, Sheets, Gmail, Calendar) bağlantı havuzunu iş parçacığı başına paylaşır:
+        # httplib2.Http thread-safe değildir, araçlar ise farklı thread'lerden çağrılır.
+        self._local = threading.local()
 
     def _authenticate(self) -> None:
         """Yetkilendirme akışını başlatır veya mevcut token'ı yükler."""
         if os.path.exists('token.json'):
-            self.creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+            # Dosya tek okumada bayt olarak alınır ve doğrudan çözümlenir (metin katmanı atlanır)
+            token_info = json.loads(Path('token.json').read_bytes())
+            self.creds = Credentials.from_authorized_user_info(token_info, SCOPES)
+        
+        if self.creds and self.creds.refresh_token:
+            self._refresh_if_needed()
         
         if not self.creds or not self.creds.valid:
-            if self.creds and self.creds.expired and self.creds.refresh_token:
-                self.creds.refresh(Request())
-            else:
-                if not os.path.exists('credentials.json'):
-                    raise FileNotFoundError("Kritik Hata: 'credentials.json' bulunamadı.")
-                flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-                self.creds = flow.run_local_server(port=0)
-            
-            # Yeni token'ı diske kaydet
-            with open('token.json', 'w') as token:
-                token.write(self.creds.to_json())
+            if not os.path.exists('credentials.json'):
+                raise FileNotFoundError("Kritik Hata: 'credentials.json' bulunamadı.")
+            flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
+            self.creds = flow.run_local_server(port=0)
+            self._save_token()
+
+    def _refresh_if_needed(self) -> None:
+        """
+        Token'ı sadece süresi dolmak üzereyse (TOKEN_REFRESH_LEEWAY) yeniler.
+        Hâlâ geçerli bir token için Google'a ağ isteği ve diske yazma yapılmaz.
+        """
+        with self._refresh_lock:
+            expiry = self.creds.expiry
+            now = datetime.now(timezone.utc).replace(tzinfo=None) # google-auth expiry'yi naive UTC tutar
+            if self.creds.token and (expiry is None or expiry - now > TOKEN_REFRESH_LEEWAY):
+                return
+            old_token = self.creds.token
+            self.creds.refresh(Request())
+            if self.creds.token != old_token:
+                self._save_token()
+
+    def _save_token(self) -> None:
+        """Güncel token'ı diske kaydeder."""
+        with open('token.json', 'w') as token:
+            token.write(self.creds.to_json())
+
+    def _thread_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """Çağıran thread'e ait yetkilendirilmiş HTTP istemcisini döndürür (ilk çağrıda oluşturur)."""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http())
+        return http
+
+    def _build_request(self, _http, *args, **kwargs) -> HttpRequest:
+        """
+        API isteğini, isteği çalıştıracak thread'in HTTP istemcisine bağlar.
+        Yenileme burada kilit altında yapılır; böylece eşzamanlı araç çağrıları token'ı
+        tek tek yenilemez ve yenilenen token diske kaydedilir.
+        """
+        if self.creds.refresh_token:
+            self._refresh_if_needed()
+        return HttpRequest(self._thread_http(), *args, **kwargs)
 
     def get_service(self, service_name: str, version: str) -> Resource:
         """Yetkilendirilmiş API servis istemcisi (Resource) döndürür."""
-        return build(service_name, version, credentials=self.creds)
+        if self.creds.refresh_token:
+            self._refresh_if_needed()
+        # static_discovery: Paketle gelen discovery dokümanı kullanılır, başlangıçta ağ isteği yapılmaz
+        return build(service_name, version, http=self._thread_http(), requestBuilder=self._build_request,
+                     cache_discovery=False, static_discovery=True)
 
 # --- ALAN SERVİSLERİ (DOMAIN MANAGERS) ---
 # Kapsülleme (Encapsulation) Prensibi:
@@ -97,7 +179,10 @@ class ContactManager:
     def __init__(self, drive_service: Resource, sheets_service: Resource):
         self.drive = drive_service
         self.sheets = sheets_service
-        self._cached_sheet_id: Optional[str] = None # API çağrılarını azaltmak için önbellek
+        # API çağrılarını azaltmak için önbellek; önceki çalıştırmadan kalan kimlik diskten okunur
+        self._cached_sheet_id: Optional[str] = self._read_state().get('sheet_id')
+        # Rehber önbelleği: (yüklenme zamanı, normalize isimler, e-postalar) - paralel diziler (SoA)
+        self._contacts_cache: Optional[Tuple[float, List[str], List[str]]] = None
 
     def _get_sheet_id(self) -> Optional[str]:
         """Rehber dosyasını Drive'da arar, bulamazsa Lazy Initialization ile oluşturur."""
@@ -113,68 +198,153 @@ class ContactManager:
             
             if files:
                 log(f"✅ Rehber bulundu: {files[0]['name']}")
-                self._cached_sheet_id = files[0]['id']
+                self._remember_sheet_id(files[0]['id'])
                 return self._cached_sheet_id
-        except Exception as e:
-            log(f"⚠️ Arama hatası: {e}")
+        except _API_ERRORS as e:
+            log(f"⚠️ Arama hatası: {_describe_api_error(e)}")
 
         # 2. Dosya yoksa oluştur (Fallback)
         return self._create_sheet()
 
+    @staticmethod
+    def _read_state() -> dict:
+        """Kalıcı sunucu durumunu okur; dosya yoksa veya bozuksa boş sözlük döndürür."""
+        try:
+            with open(STATE_FILE, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _remember_sheet_id(self, sheet_id: Optional[str]) -> None:
+        """Rehber kimliğini bellekte ve diskte günceller (None: önbelleği geçersiz kılar)."""
+        self._cached_sheet_id = sheet_id
+        self._contacts_cache = None
+        state = self._read_state()
+        if sheet_id:
+            state['sheet_id'] = sheet_id
+        else:
+            state.pop('sheet_id', None)
+        try:
+            with open(STATE_FILE, 'w', encoding="utf-8") as f:
+                json.dump(state, f)
+        except OSError as e:
+            log(f"⚠️ Durum dosyası yazılamadı: {e}")
+
     def _create_sheet(self) -> Optional[str]:
         """Yeni bir Google Sheet oluşturur ve varsayılan başlıkları (Header) ekler."""
         log("ℹ️ Rehber oluşturuluyor...")
         try:
-            file_metadata = {'name': CONTACTS_FILE_NAME, 'mimeType': 'application/vnd.google-apps.spreadsheet'}
-            spreadsheet = self.drive.files().create(body=file_metadata, fields='id').execute()
-            new_id = spreadsheet.get('id')
-            
-            values = [['İsim Soyisim', 'E-Posta Adresi']]
-            self.sheets.spreadsheets().values().update(
-                spreadsheetId=new_id, range='A1:B1',
-                valueInputOption='RAW', body={'values': values}).execute()
+            # Dosya ve başlık satırı tek bir API çağrısıyla oluşturulur
+            header = [{'userEnteredValue': {'stringValue': title}}
+                      for title in ('İsim Soyisim', 'E-Posta Adresi')]
+            body = {
+                'properties': {'title': CONTACTS_FILE_NAME},
+                'sheets': [{'data': [{'startRow': 0, 'startColumn': 0,
+                                      'rowData': [{'values': header}]}]}]
+            }
+            spreadsheet = self.sheets.spreadsheets().create(body=body, fields='spreadsheetId').execute()
+            new_id = spreadsheet.get('spreadsheetId')
             
-            self._cached_sheet_id = new_id
+            self._remember_sheet_id(new_id)
             return new_id
-        except Exception as e:
-            log(f"❌ Oluşturma hatası: {e}")
+        except _API_ERRORS as e:
+            log(f"❌ Oluşturma hatası: {_describe_api_error(e)}")
             return None
 
+    def _load_contacts(self, sheet_id: str) -> Tuple[List[str], List[str]]:
+        """
+        Rehberi (normalize isimler, e-postalar) paralel listeleri olarak döndürür.
+        
+        İsimler yükleme anında bir kez küçük harfe çevrilip kırpılır; aramalar ek
+        dönüşüm yapmadan bu listeleri okur. Sonuç CONTACTS_CACHE_TTL saniye boyunca
+        bellekte tutulur; bu sürede tekrar eden aramalar Sheets API'ye istek göndermez.
+        """
+        cache = self._contacts_cache
+        if cache and time.monotonic() - cache[0] < CONTACTS_CACHE_TTL:
+            return cache[1], cache[2]
+        # Başlık satırı aralık dışında bırakılır; 'fields' maskesi yanıtı sadece değerlerle sınırlar.
+        # Sayfa adı verilmez: Türkçe yerel ayarlı tablolarda ilk sayfa 'Sayfa1' adını taşır.
+        result = self.sheets.spreadsheets().values().get(
+            spreadsheetId=sheet_id, range='A2:B', majorDimension='ROWS',
+            valueRenderOption='UNFORMATTED_VALUE', fields='values').execute()
+        valid = [row for row in result.get('values', []) if len(row) >= 2 and row[0]]
+        # UNFORMATTED_VALUE sayısal hücreleri int/float döndürebilir
+        names = [str(row[0]).lower().strip() for row in valid]
+        emails = [str(row[1]).strip() for row in valid]
+        self._contacts_cache = (time.monotonic(), names, emails)
+        return names, emails
+
+    @staticmethod
+    def _difflib_best_match(target: str, names: List[str]) -> Optional[int]:
+        """
+        rapidfuzz yokken kullanılan yedek (Fallback) bulanık eşleşme.
+        
+        rapidfuzz yolundaki fuzz.ratio ile aynı ölçü (normalize benzerlik) kullanılır.
+        ratio() simetrik olmadığından argüman sırası önceki sürümle aynıdır
+        (hedef seq1, rehber ismi seq2). Pahalı ratio() hesabından önce ucuz üst sınırlar
+        (real_quick_ratio: uzunluk, quick_ratio: karakter kümesi) denenir; sınırı mevcut
+        en iyi skoru geçemeyen satırlar atlanır, bu budama sonucu değiştirmez.
+        """
+        matcher = difflib.SequenceMatcher(None)
+        matcher.set_seq1(target)
+        best_index, best_score = None, FUZZY_SCORE_CUTOFF / 100
+        for i, contact_name in enumerate(names):
+            matcher.set_seq2(contact_name)
+            if matcher.real_quick_ratio() <= best_score or matcher.quick_ratio() <= best_score:
+                continue
+            score = matcher.ratio()
+            if score > best_score:
+                best_index, best_score = i, score
+        return best_index
+
     def find_email(self, name: str) -> str:
         """
         Verilen isme göre e-posta adresini bulur.
         
-        Algoritma: Difflib kullanarak 'String Similarity' (Benzerlik) analizi yapar.
+        Algoritma: rapidfuzz (ratio) ile, kurulu değilse difflib ile 'String Similarity' (Benzerlik) analizi yapar.
         Bu sayede kullanıcı 'Engin' yazdığında 'Engin Vardar' kaydını bulabilir.
         """
         sheet_id = self._get_sheet_id()
         if not sheet_id: return "HATA: Rehber erişilemedi."
 
         try:
-            result = self.sheets.spreadsheets().values().get(spreadsheetId=sheet_id, range='A:B').execute()
-            rows = result.get('values', [])
-            if len(rows) < 2: return "Rehber boş."
+            try:
+                names, emails = self._load_contacts(sheet_id)
+            except HttpError as e:
+                if e.resp.status != 404: raise
+                # Kayıtlı kimliğe ait dosya silinmiş: önbelleği geçersiz kıl ve Drive'da yeniden ara
+                log("⚠️ Kayıtlı rehber bulunamadı, yeniden aranıyor...")
+                self._remember_sheet_id(None)
+                sheet_id = self._get_sheet_id()
+                if not sheet_id: return "HATA: Rehber erişilemedi."
+                names, emails = self._load_contacts(sheet_id)
+            if not names: return "Rehber boş."
 
             target = name.lower().strip()
-            best_match = None
-            highest_score = 0.0
-
-            for row in rows[1:]:
-                if len(row) < 2: continue
-                contact_name, contact_email = row[0].lower().strip(), row[1].strip()
-                
-                # Tam eşleşme (Exact Match)
+            if not target: return "BULUNAMADI"
+            
+            # Hızlı yol 1 - Tam eşleşme (Exact Match): list.index taraması C seviyesinde yapılır
+            try:
+                return emails[names.index(target)]
+            except ValueError:
+                pass
+            
+            # Hızlı yol 2 - Alt dizi eşleşmesi (Substring Match): 'Engin' -> 'Engin Vardar'
+            for contact_name, contact_email in zip(names, emails):
                 if target in contact_name: return contact_email
-                
-                # Bulanık eşleşme (Fuzzy Match)
-                score = difflib.SequenceMatcher(None, target, contact_name).ratio()
-                if score > 0.6 and score > highest_score:
-                    highest_score = score
-                    best_match = contact_email
             
-            return best_match if best_match else "BULUNAMADI"
-        except Exception as e:
-            return f"HATA: {e}"
+            # Bulanık eşleşme (Fuzzy Match): tüm tarama rapidfuzz'un C++ çekirdeğinde yapılır.
+            # fuzz.ratio, difflib'in ratio() ölçüsüyle aynı normalize benzerliktir; WRatio gibi kısmi
+            # eşleşmeleri ödüllendirmez, bu yüzden rehberde olmayan isimler yanlış kişiye eşlenmez.
+            if process is not None:
+                match = process.extractOne(target, names, scorer=fuzz.ratio, score_cutoff=FUZZY_SCORE_CUTOFF)
+                index = match[2] if match else None
+            else:
+                index = self._difflib_best_match(target, names)
+            return emails[index] if index is not None else "BULUNAMADI"
+        except _API_ERRORS as e:
+            return f"HATA: {_describe_api_error(e)}"
 
 class EmailManager:
     """
@@ -187,33 +357,49 @@ class EmailManager:
     def get_latest(self) -> str:
         """Gelen kutusundaki (Inbox) en son maili getirir ve parse eder."""
         try:
-            res = self.service.users().messages().list(userId='me', maxResults=1, labelIds=['INBOX']).execute()
+            res = self.service.users().messages().list(userId=GMAIL_USER_ID, maxResults=1, labelIds=['INBOX'],
+                                                     fields='messages/id').execute()
             msgs = res.get('messages', [])
             if not msgs: return "Gelen kutusu boş."
-            
-            msg = self.service.users().messages().get(userId='me', id=msgs[0]['id'], format='full').execute()
-            headers = msg['payload']['headers']
-            
-            subj = next((h['value'] for h in headers if h['name'] == 'Subject'), '(Yok)')
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), '(Bilinmiyor)')
-            sender_email = sender.split("<")[1].split(">")[0] if "<" in sender else sender
-            
-            return f"From: {sender}\nSenderEmail: {sender_email}\nSubject: {subj}\nContent: {msg.get('snippet','')}"
-        except Exception as e:
-            return f"Hata: {e}"
+            return self._fetch_message(msgs[0]['id'])
+        except _API_ERRORS as e:
+            return f"Hata: {_describe_api_error(e)}"
+
+    def get_recent(self, count: int) -> List[str]:
+        """Gelen kutusundaki son `count` maili (en yeniden eskiye) getirir ve parse eder."""
+        try:
+            res = self.service.users().messages().list(userId=GMAIL_USER_ID, maxResults=count, labelIds=['INBOX'],
+                                                     fields='messages/id').execute()
+            return [self._fetch_message(m['id']) for m in res.get('messages', [])]
+        except _API_ERRORS as e:
+            return [f"Hata: {_describe_api_error(e)}"]
+
+    def _fetch_message(self, msg_id: str) -> str:
+        """Tek bir mesajı çekip 'From/SenderEmail/Subject/Content' metnine dönüştürür."""
+        # 'metadata' formatı MIME gövdesini getirmez; sadece istenen başlıklar ve snippet döner
+        msg = self.service.users().messages().get(
+            userId=GMAIL_USER_ID, id=msg_id, format='metadata', metadataHeaders=['Subject', 'From'],
+            fields='payload/headers,snippet').execute()
+        headers = {h['name']: h['value'] for h in msg.get('payload', {}).get('headers', [])}
+        
+        subj = headers.get('Subject', '(Yok)')
+        sender = headers.get('From', '(Bilinmiyor)')
+        sender_email = sender.partition("<")[2].partition(">")[0] or sender
+        
+        return f"From: {sender}\nSenderEmail: {sender_email}\nSubject: {subj}\nContent: {msg.get('snippet','')}"
 
     def send(self, to: str, subject: str, content: str) -> str:
         """MIMEText formatında mail oluşturur ve base64 kodlaması ile API'ye iletir."""
         try:
-            if "<" in to: to = to.split("<")[1].replace(">", "")
+            to = to.partition("<")[2].partition(">")[0] or to  # 'İsim <adres>' -> 'adres'
             msg = MIMEText(content)
             msg['to'] = to
             msg['subject'] = subject
-            raw = base64.urlsafe_b64encode(msg.as_bytes()).decode()
-            self.service.users().messages().send(userId='me', body={'raw': raw}).execute()
+            raw = base64.urlsafe_b64encode(msg.as_bytes()).decode('ascii')  # base64 çıktısı saf ASCII'dir
+            self.service.users().messages().send(userId=GMAIL_USER_ID, body={'raw': raw}).execute()
             return "Mail Gönderildi!"
-        except Exception as e:
-            return f"Hata: {e}"
+        except _API_ERRORS as e:
+            return f"Hata: {_describe_api_error(e)}"
 
 class CalendarManager:
     """
@@ -223,56 +409,120 @@ class CalendarManager:
     def __init__(self, service: Resource):
         self.service = service
 
+    @staticmethod
+    def _build_event(summary: str, iso_datetime: str) -> Tuple[dict, datetime]:
+        """ISO tarihten 1 saatlik etkinlik gövdesini ve başlangıç zamanını oluşturur."""
+        if _FROMISOFORMAT_ACCEPTS_Z:
+            start_dt = datetime.fromisoformat(iso_datetime)
+            # Sondaki 'Z' UTC değil yerel (İstanbul) saat olarak yorumlanır
+            if iso_datetime.endswith("Z"): start_dt = start_dt.replace(tzinfo=None)
+        else:
+            start_dt = datetime.fromisoformat(iso_datetime.replace("Z", ""))
+        end_dt = start_dt + timedelta(hours=1)
+        
+        event = {
+            'summary': summary,
+            'start': {'dateTime': start_dt.isoformat(), **_TZ},
+            'end': {'dateTime': end_dt.isoformat(), **_TZ},
+        }
+        return event, start_dt
+
     def schedule(self, summary: str, iso_datetime: str) -> str:
         """Verilen ISO tarih formatına göre 1 saatlik standart toplantı oluşturur."""
         try:
             if not iso_datetime: return "Tarih hatası"
-            clean_date = iso_datetime.replace("Z", "")
-            start_dt = datetime.fromisoformat(clean_date)
-            end_dt = start_dt + timedelta(hours=1)
-            
-            event = {
-                'summary': summary,
-                'start': {'dateTime': start_dt.isoformat(), 'timeZone': 'Europe/Istanbul'},
-                'end': {'dateTime': end_dt.isoformat(), 'timeZone': 'Europe/Istanbul'},
-            }
-            self.service.events().insert(calendarId='primary', body=event).execute()
+            event, start_dt = self._build_event(summary, iso_datetime)
+            self.service.events().insert(calendarId=CALENDAR_ID, body=event).execute()
             return f"Takvime Eklendi: {start_dt.strftime('%H:%M')}"
-        except Exception as e:
+        except ValueError as e: # Geçersiz ISO tarih
             return f"Takvim Hatası: {e}"
+        except _API_ERRORS as e:
+            return f"Takvim Hatası: {_describe_api_error(e)}"
+
+    def schedule_many(self, items: List[Dict[str, str]]) -> str:
+        """
+        Birden fazla toplantıyı Calendar Batch uç noktası üzerinden ekler.
+        
+        Her CALENDAR_BATCH_LIMIT etkinlik tek bir HTTP isteğinde gönderilir; N ayrı
+        istek yerine tek gidiş-dönüş (Round-Trip) yapılır. Sonuç, her etkinlik için
+        bir satır içerir.
+        """
+        if not items: return "Etkinlik listesi boş."
+        results = ["Tarih hatası"] * len(items)
+        pending = []  # (sıra, etkinlik gövdesi, başlangıç zamanı)
+        for i, item in enumerate(items):
+            iso_datetime = item.get('iso_datetime', '')
+            if not iso_datetime: continue
+            try:
+                pending.append((i, *self._build_event(item.get('summary', ''), iso_datetime)))
+            except ValueError as e:
+                results[i] = f"Takvim Hatası: {e}"
+        
+        start_times = {str(i): start_dt for i, _, start_dt in pending}
+        def on_done(request_id: str, _response: dict, exception: Optional[Exception]) -> None:
+            i = int(request_id)
+            results[i] = (f"Takvim Hatası: {_describe_api_error(exception)}" if exception
+                          else f"Takvime Eklendi: {start_times[request_id].strftime('%H:%M')}")
+        
+        try:
+            for offset in range(0, len(pending), CALENDAR_BATCH_LIMIT):
+                batch = self.service.new_batch_http_request(callback=on_done)
+                for i, event, _ in pending[offset:offset + CALENDAR_BATCH_LIMIT]:
+                    batch.add(self.service.events().insert(calendarId=CALENDAR_ID, body=event), request_id=str(i))
+                batch.execute()
+        except _API_ERRORS as e:
+            return f"Takvim Hatası: {_describe_api_error(e)}"
+        return "\n".join(f"{item.get('summary', '')}: {result}" for item, result in zip(items, results))
 
 # --- INITIALIZATION (BAĞIMLILIK ENJEKSİYONU) ---
 # Global servisleri başlat ve Dependency Injection ile yöneticilere dağıt.
 auth = GoogleAuthManager()
-contacts_mgr = ContactManager(auth.get_service('drive', 'v3'), auth.get_service('sheets', 'v4'))
-email_mgr = EmailManager(auth.get_service('gmail', 'v1'))
-calendar_mgr = CalendarManager(auth.get_service('calendar', 'v3'))
+# Servis istemcileri birbirinden bağımsızdır; discovery yükleme/ayrıştırma işleri paralel yürütülür
+with ThreadPoolExecutor(max_workers=4) as executor:
+    drive_service, sheets_service, gmail_service, calendar_service = executor.map(
+        lambda api: auth.get_service(*api),
+        [('drive', 'v3'), ('sheets', 'v4'), ('gmail', 'v1'), ('calendar', 'v3')])
+contacts_mgr = ContactManager(drive_service, sheets_service)
+email_mgr = EmailManager(gmail_service)
+calendar_mgr = CalendarManager(calendar_service)
 
 mcp = FastMCP("TeacherAssistantServer")
 
 # --- MCP ARAÇLARI (TOOLS) ---
 # Bu fonksiyonlar, dış dünyadan (Client) gelen istekleri karşılayan uç noktalardır (Endpoints).
 # Logic katmanı burada değil, yukarıdaki Manager sınıflarındadır.
+# Google API çağrıları bloklayıcıdır; asyncio.to_thread ile olay döngüsünün dışında çalıştırılır,
+# böylece eşzamanlı araç çağrıları birbirini beklemez.
 
 @mcp.tool()
-def find_email_by_name(name: str) -> str:
+async def find_email_by_name(name: str) -> str:
     """Kişi isminden e-posta adresini bulur."""
-    return contacts_mgr.find_email(name)
+    return await asyncio.to_thread(contacts_mgr.find_email, name)
 
 @mcp.tool()
-def get_latest_email() -> str:
+async def get_latest_email() -> str:
     """Son gelen e-postayı getirir."""
-    return email_mgr.get_latest()
+    return await asyncio.to_thread(email_mgr.get_latest)
+
+@mcp.tool()
+async def get_latest_emails(count: int = 5) -> List[str]:
+    """Son gelen `count` e-postayı (en yeniden eskiye) getirir."""
+    return await asyncio.to_thread(email_mgr.get_recent, count)
 
 @mcp.tool()
-def send_email_action(to_email: str, subject: str, content: str) -> str:
+async def send_email_action(to_email: str, subject: str, content: str) -> str:
     """Belirtilen alıcıya e-posta gönderir."""
-    return email_mgr.send(to_email, subject, content)
+    return await asyncio.to_thread(email_mgr.send, to_email, subject, content)
 
 @mcp.tool()
-def schedule_meeting(summary: str, iso_datetime: str) -> str:
+async def schedule_meeting(summary: str, iso_datetime: str) -> str:
     """Takvime yeni bir toplantı ekler."""
-    return calendar_mgr.schedule(summary, iso_datetime)
+    return await asyncio.to_thread(calendar_mgr.schedule, summary, iso_datetime)
+
+@mcp.tool()
+async def schedule_meetings(items: List[Dict[str, str]]) -> str:
+    """Takvime birden fazla toplantıyı tek istekte ekler. Her öğe: {'summary', 'iso_datetime'}."""
+    return await asyncio.to_thread(calendar_mgr.schedule_many, items)
 
 if __name__ == "__main__":
     log("🚀 Sunucu başlatılıyor...")